@@ -15,7 +15,6 @@ from pathlib import Path
 from typing import Any, Iterable
 
 import dill as pickle
-import inflect
 import numpy as np
 import pandas as pd
 import stringcase
@@ -53,7 +52,23 @@ def is_nonzero_file(fpath: PathLike) -> bool:
     return os.path.isfile(fpath) and os.path.getsize(fpath) > 0
 
 
-_inflect_engine = inflect.engine()
+_inflect_engine = None
+
+
+def _singular_noun(word: str) -> str | bool:
+    """Returns the singular form of the word or False if it is not a plural noun.
+
+    Remarks:
+
+        - inflect is only imported on first use as it is by far the slowest import of the library.
+
+    """
+    global _inflect_engine
+    if _inflect_engine is None:
+        import inflect
+
+        _inflect_engine = inflect.engine()
+    return _inflect_engine.singular_noun(word)
 
 
 class ConfigReader:
@@ -99,7 +114,7 @@ class ConfigReader:
                 else:
                     myconfig[k] = obj
             elif isinstance(v, Iterable) and not isinstance(v, str):
-                singular = _inflect_engine.singular_noun(k)
+                singular = _singular_noun(k)
                 if singular is False:
                     singular = k
                 if class_name is None:
@@ -11,7 +11,7 @@ import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from os import PathLike
-from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, NamedTuple
 
 from attrs import define
 
@@ -25,10 +25,12 @@ from negmas.negotiators import Negotiator
 from negmas.outcomes import Outcome
 from negmas.outcomes.common import check_one_and_only, ensure_os
 from negmas.outcomes.protocols import OutcomeSpace
-from negmas.preferences import nash_point, pareto_frontier
+from negmas.preferences import nash_point, pareto_frontier, utility_matrix
 from negmas.types import NamedObject
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from negmas.outcomes.base_issue import Issue
     from negmas.outcomes.protocols import DiscreteOutcomeSpace
     from negmas.preferences import Preferences
@@ -62,6 +64,19 @@ class MechanismRoundResult:
     """A mapping from negotiator ID to the time it consumed during this round"""
 
 
+class _ParetoData(NamedTuple):
+    """The data used to find the pareto frontier and nash point of a mechanism"""
+
+    ufuns: tuple[BaseUtilityFunction, ...]
+    """The ufuns of the negotiators"""
+    outcomes: list[Outcome]
+    """The outcomes considered"""
+    utilities: np.ndarray
+    """The utilities of all outcomes (a row per outcome and a column per ufun)"""
+    frontiers: dict[bool, tuple[list[tuple[float]], list[int]]]
+    """The pareto frontiers found so far and the indices of their outcomes keyed by `sort_by_welfare`"""
+
+
 # noinspection PyAttributeOutsideInit
 class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
     """
@@ -196,6 +211,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         self._start_time = None
         self.__discrete_os = None
         self.__discrete_outcomes = None
+        self.__pareto_cache: _ParetoData | None = None
         self._extra_callbacks = extra_callbacks
 
         self.agents_of_role = defaultdict(list)
@@ -1101,34 +1117,67 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             preferences.append(a.preferences)
         return preferences
 
-    def pareto_frontier(
-        self, max_cardinality=None, sort_by_welfare=True
-    ) -> tuple[list[tuple[float]], list[Outcome]]:
-        ufuns = self._get_preferencess()
+    def _pareto_data(self, max_cardinality=None) -> _ParetoData:
+        """Returns the ufuns, outcomes, their utilities and the pareto frontiers found so far"""
+        ufuns = tuple(self._get_preferencess())
         if any(_ is None for _ in ufuns):
             raise ValueError(
                 "Some negotiators have no ufuns. Cannot calcualate the pareto frontier"
             )
-        frontier, indices = pareto_frontier(
-            ufuns=ufuns,
-            n_discretization=None,
-            sort_by_welfare=sort_by_welfare,
-            outcomes=self.discrete_outcomes(max_cardinality=max_cardinality),
-        )
+        outcomes = self.discrete_outcomes(max_cardinality=max_cardinality)
+        cached = self.__pareto_cache
+        if (
+            cached is not None
+            and cached.outcomes == outcomes
+            and len(cached.ufuns) == len(ufuns)
+            and all(a is b for a, b in zip(cached.ufuns, ufuns))
+        ):
+            return cached
+        cached = _ParetoData(ufuns, outcomes, utility_matrix(ufuns, outcomes), dict())
+        # utilities of non-stationary ufuns may change between calls
+        stationary = all(_.is_stationary() for _ in ufuns)
+        self.__pareto_cache = cached if stationary else None
+        return cached
+
+    def _find_pareto_frontier(
+        self, data: _ParetoData, sort_by_welfare: bool
+    ) -> tuple[list[tuple[float]], list[int]]:
+        """Finds the pareto frontier for the given `_pareto_data` reusing it if already found"""
+        if sort_by_welfare not in data.frontiers:
+            data.frontiers[sort_by_welfare] = pareto_frontier(
+                ufuns=data.ufuns,
+                sort_by_welfare=sort_by_welfare,
+                utilities=data.utilities,
+            )
+        frontier, indices = data.frontiers[sort_by_welfare]
         if frontier is None:
             raise ValueError("Cound not find the pareto-frontier")
-        return frontier, [
-            self.discrete_outcomes(max_cardinality=max_cardinality)[_] for _ in indices
-        ]
+        return list(frontier), indices
+
+    def pareto_frontier(
+        self, max_cardinality=None, sort_by_welfare=True
+    ) -> tuple[list[tuple[float]], list[Outcome]]:
+        """
+        Finds the pareto-frontier of the negotiation
+
+        Remarks:
+            - The result is cached and reused as long as the outcomes do not change and the
+              negotiators keep the same ufun objects. Modifying a ufun in place does not
+              invalidate the cache.
+            - Nothing is cached if any ufun is not stationary.
+        """
+        data = self._pareto_data(max_cardinality)
+        frontier, indices = self._find_pareto_frontier(data, sort_by_welfare)
+        return frontier, [data.outcomes[_] for _ in indices]
 
     def nash_point(
         self, max_cardinality=None, frontier: list[tuple[float]] | None = None
     ) -> tuple[tuple[float], Outcome]:
-        ufuns = self._get_preferencess()
+        # the utilities evaluated for the pareto-frontier give the utility ranges
+        data = self._pareto_data(max_cardinality)
         if not frontier:
-            frontier, _ = self.pareto_frontier(max_cardinality)
-        outcomes = tuple(self.discrete_outcomes(max_cardinality=max_cardinality))
-        nash_utils, indx = nash_point(ufuns, frontier, outcomes=outcomes)
+            frontier, _ = self._find_pareto_frontier(data, sort_by_welfare=True)
+        nash_utils, indx = nash_point(data.ufuns, frontier, utilities=data.utilities)
         if not nash_utils or indx is None:
             raise ValueError("Cannot find the nash-point")
         return nash_utils, frontier[indx]
@@ -77,8 +77,8 @@ class ContiguousIssue(RangeIssue, DiscreteIssue):
                 n, grid=grid, compact=compact, endpoints=endpoints
             )
 
-        beg = (self.cardinality - n) // 2
-        return ContiguousIssue((int(beg), int(beg + n)), name=self.name + f"{n}")
+        beg = self.min_value + (self.cardinality - n) // 2
+        return ContiguousIssue((int(beg), int(beg + n - 1)), name=self.name + f"{n}")
 
     def rand(self) -> int:
         """Picks a random valid value."""
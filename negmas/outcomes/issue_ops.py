@@ -30,6 +30,7 @@ __all__ = [
     "num_outcomes",
     "enumerate_issues",
     "enumerate_discrete_issues",
+    "discretize_issues",
     "discretize_and_enumerate_issues",
     "sample_issues",
     "sample_outcomes",
@@ -815,6 +816,26 @@ def generate_issues(
     return tuple(result)
 
 
+def discretize_issues(
+    issues: Iterable[Issue], n_discretization: int | None = 10
+) -> list[Issue]:
+    """
+    Discretizes the infinite issues in a list of issues.
+
+    Args:
+        issues: The list of issues.
+        n_discretization: The number of values to sample from each infinite issue
+    Returns:
+        list of finite issues (finite input issues are returned as they are).
+    """
+    return [
+        _
+        if _.is_finite()
+        else make_issue(values=list(_.value_generator(n_discretization)), name=_.name)
+        for _ in issues
+    ]
+
+
 def discretize_and_enumerate_issues(
     issues: Iterable[Issue],
     n_discretization: int | None = 10,
@@ -829,12 +850,7 @@ def discretize_and_enumerate_issues(
     Returns:
         list of outcomes of the given type.
     """
-    issues = [
-        _
-        if _.is_finite()
-        else make_issue(values=list(_.value_generator(n_discretization)), name=_.name)
-        for _ in issues
-    ]
+    issues = discretize_issues(issues, n_discretization)
     return enumerate_issues(issues, max_cardinality=max_cardinality)
 
 
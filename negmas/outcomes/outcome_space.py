@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import random
-from functools import reduce
-from operator import mul
+from heapq import heapify, heappop, heappush
+from math import prod
 from typing import Callable, Iterable, Sequence, Union
 
+import numpy as np
 from attr import define, field
 
 from negmas.helpers import unique_name
@@ -18,7 +19,7 @@ from negmas.protocols import XmlSerializable
 from negmas.serialization import PYTHON_CLASS_IDENTIFIER, deserialize, serialize
 from negmas.warnings import NegmasSpeedWarning, warn
 
-from .base_issue import DiscreteIssue, Issue
+from .base_issue import Issue
 from .categorical_issue import CategoricalIssue
 from .common import Outcome
 from .contiguous_issue import ContiguousIssue
@@ -40,6 +41,7 @@ __all__ = [
 ]
 
 NLEVELS = 5
+DISCRETIZATION_CACHE_SIZE = 8
 
 
 DistanceFun = Callable[[Outcome, Outcome, Union[OutcomeSpace, None]], float]
@@ -81,7 +83,7 @@ def make_os(
     return CartesianOutcomeSpace(issues_, name=name if name else "")
 
 
-@define(frozen=True)
+@define(frozen=True, hash=False)
 class CartesianOutcomeSpace(XmlSerializable):
     """
     An outcome-space that is generated by the cartesian product of a tuple of `Issue` s.
@@ -89,10 +91,82 @@ class CartesianOutcomeSpace(XmlSerializable):
 
     issues: tuple[Issue] = field(converter=tuple)
     name: str | None = field(eq=False, default=None)
+    _cardinality: int | float = field(init=False, eq=False, repr=False)
+    _is_discrete: bool = field(init=False, eq=False, repr=False)
+    _is_all_continuous: bool = field(init=False, eq=False, repr=False)
+    _is_continuous_any: bool = field(init=False, eq=False, repr=False)
+    _is_numeric: bool = field(init=False, eq=False, repr=False)
+    _is_integer: bool = field(init=False, eq=False, repr=False)
+    _is_float: bool = field(init=False, eq=False, repr=False)
+    _is_compact: bool = field(init=False, eq=False, repr=False)
+    _value_sets: tuple | None = field(init=False, eq=False, repr=False, default=None)
+    _issue_names: tuple[str, ...] = field(init=False, eq=False, repr=False)
+    _hash: int = field(init=False, eq=False, repr=False)
+    _to_discrete_cache: dict = field(init=False, eq=False, repr=False, factory=dict)
+    _strides: tuple[int, ...] | None = field(
+        init=False, eq=False, repr=False, default=None
+    )
+    _value_indices: tuple | None = field(init=False, eq=False, repr=False, default=None)
 
     def __attrs_post_init__(self):
         if not self.name:
             object.__setattr__(self, "name", unique_name("os", add_time=False, sep=""))
+        self._cache_issue_properties()
+
+    def _cache_issue_properties(self):
+        """
+        Caches the cardinality and the predicates that depend only on the issues.
+
+        Remarks:
+            - The outcome-space is frozen so these values can be calculated once in a single pass over the issues.
+            - The hash depends only on issue names and cardinalities. Equal issues have the same name and values
+              so equal outcome-spaces still have equal hashes while avoiding the (string based) hashing of the
+              values of every issue.
+        """
+        cardinality = 1
+        cardinalities = []
+        discrete, all_continuous, continuous_any = True, True, False
+        numeric, integer, real, compact = True, True, True, True
+        range_issue = RangeIssue
+        for issue in self.issues:
+            cardinalities.append(issue.cardinality)
+            cardinality *= cardinalities[-1]
+            continuous = issue.is_continuous()
+            discrete = discrete and issue.is_discrete()
+            all_continuous = all_continuous and continuous
+            continuous_any = continuous_any or continuous
+            numeric = numeric and issue.is_numeric()
+            integer = integer and numeric and issue.is_integer()
+            real = real and numeric and issue.is_float()
+            compact = compact and isinstance(issue, range_issue)
+        object.__setattr__(self, "_cardinality", cardinality)
+        object.__setattr__(self, "_is_discrete", discrete)
+        object.__setattr__(self, "_is_all_continuous", all_continuous)
+        object.__setattr__(self, "_is_continuous_any", continuous_any)
+        object.__setattr__(self, "_is_numeric", numeric)
+        object.__setattr__(self, "_is_integer", integer)
+        object.__setattr__(self, "_is_float", real)
+        object.__setattr__(self, "_is_compact", compact)
+        object.__setattr__(self, "_issue_names", tuple(_.name for _ in self.issues))
+        object.__setattr__(
+            self, "_hash", hash((self._issue_names, tuple(cardinalities)))
+        )
+
+    def __hash__(self):
+        return self._hash
+
+    def __getstate__(self):
+        # cached values are not pickled because string hashes are not stable across processes
+        return dict(issues=self.issues, name=self.name)
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "issues", state["issues"])
+        object.__setattr__(self, "name", state["name"])
+        object.__setattr__(self, "_value_sets", None)
+        object.__setattr__(self, "_to_discrete_cache", dict())
+        object.__setattr__(self, "_strides", None)
+        object.__setattr__(self, "_value_indices", None)
+        self._cache_issue_properties()
 
     def contains_issue(self, x: Issue) -> bool:
         """Cheks that the given issue is in the tuple of issues constituting the outcome space (i.e. it is one of its dimensions)"""
@@ -101,9 +175,74 @@ class CartesianOutcomeSpace(XmlSerializable):
     def is_valid(self, outcome: Outcome) -> bool:
         return outcome_is_valid(outcome, self.issues)
 
+    def is_valid_batch(self, outcomes: Sequence[Outcome]) -> np.ndarray:
+        """
+        Checks the validity of a batch of outcomes at once.
+
+        Args:
+            outcomes: The outcomes to check. Each must be a tuple with a value for every issue.
+
+        Returns:
+            A boolean array with one value per outcome that is the same as what `is_valid` returns for it.
+
+        Remarks:
+            - Numeric values of range issues are checked using vectorized comparisons against the issue limits.
+            - Values of issues defined by a list of values are checked against a set of these values that is
+              calculated once per outcome-space.
+        """
+        n = len(outcomes)
+        valid = np.ones(n, dtype=bool)
+        if not n:
+            return valid
+        for issue, value_set, col in zip(
+            self.issues, self._issue_value_sets(), zip(*outcomes)
+        ):
+            if isinstance(issue, RangeIssue):
+                mn, mx = issue.min_value, issue.max_value
+                values = np.asarray(col)
+                if values.dtype.kind in "biuf":
+                    valid &= (values >= mn) & (values <= mx)
+                else:
+                    valid &= np.fromiter(
+                        (not isinstance(v, str) and mn <= v <= mx for v in col),
+                        dtype=bool,
+                        count=n,
+                    )
+            if value_set is None:
+                continue
+            try:
+                valid &= np.fromiter((v in value_set for v in col), dtype=bool, count=n)
+            except TypeError:
+                # unhashable values can only be found by searching the list of values
+                valid &= np.fromiter(
+                    (v in issue.values for v in col), dtype=bool, count=n
+                )
+        return valid
+
+    def _issue_value_sets(self) -> tuple:
+        """
+        Returns for each issue the set of its values if it is defined by a list of values or None otherwise.
+
+        Remarks:
+            - Calculated on first use and cached. Issues with unhashable values get their list of values instead.
+        """
+        if self._value_sets is None:
+            value_sets = []
+            for issue in self.issues:
+                values = issue.values
+                if not isinstance(values, list):
+                    value_sets.append(None)
+                    continue
+                try:
+                    value_sets.append(frozenset(values))
+                except TypeError:
+                    value_sets.append(values)
+            object.__setattr__(self, "_value_sets", tuple(value_sets))
+        return self._value_sets  # type: ignore Cannot be None at this point
+
     def is_discrete(self) -> bool:
         """Checks whether all issues are discrete"""
-        return all(_.is_discrete() for _ in self.issues)
+        return self._is_discrete
 
     def is_finite(self) -> bool:
         """Checks whether the space is finite"""
@@ -142,36 +281,36 @@ class CartesianOutcomeSpace(XmlSerializable):
     @property
     def issue_names(self) -> list[str]:
         """Returns an ordered list of issue names"""
-        return [_.name for _ in self.issues]
+        return list(self._issue_names)
 
     @property
     def cardinality(self) -> int | float:
         """The space cardinality = the number of outcomes"""
-        return reduce(mul, [_.cardinality for _ in self.issues], 1)
+        return self._cardinality
 
     def is_compact(self) -> bool:
         """Checks whether all issues are complete ranges"""
-        return all(isinstance(_, RangeIssue) for _ in self.issues)
+        return self._is_compact
 
     def is_all_continuous(self) -> bool:
         """Checks whether all issues are discrete"""
-        return all(_.is_continuous() for _ in self.issues)
+        return self._is_all_continuous
 
     def is_not_discrete(self) -> bool:
         """Checks whether all issues are discrete"""
-        return any(_.is_continuous() for _ in self.issues)
+        return self._is_continuous_any
 
     def is_numeric(self) -> bool:
         """Checks whether all issues are numeric"""
-        return all(_.is_numeric() for _ in self.issues)
+        return self._is_numeric
 
     def is_integer(self) -> bool:
         """Checks whether all issues are integer"""
-        return all(_.is_integer() for _ in self.issues)
+        return self._is_integer
 
     def is_float(self) -> bool:
         """Checks whether all issues are real"""
-        return all(_.is_float() for _ in self.issues)
+        return self._is_float
 
     def to_discrete(
         self, levels: int | float = 10, max_cardinality: int | float = float("inf")
@@ -180,25 +319,44 @@ class CartesianOutcomeSpace(XmlSerializable):
         Discretizes the outcome space by sampling `levels` values for each continuous issue.
 
         The result of the discretization is stable in the sense that repeated calls will return the same output.
+
+        Remarks:
+            - The results of the last `DISCRETIZATION_CACHE_SIZE` distinct calls are cached and returned as they are.
         """
+        key = (levels, max_cardinality)
+        dos = self._to_discrete_cache.get(key, None)
+        if dos is not None:
+            return dos
+        dos = self._to_discrete(levels, max_cardinality)
+        if len(self._to_discrete_cache) >= DISCRETIZATION_CACHE_SIZE:
+            del self._to_discrete_cache[next(iter(self._to_discrete_cache))]
+        self._to_discrete_cache[key] = dos
+        return dos
+
+    def _to_discrete(
+        self, levels: int | float, max_cardinality: int | float
+    ) -> DiscreteCartesianOutcomeSpace:
+        if self._is_discrete:
+            if self._cardinality > max_cardinality:
+                raise ValueError(
+                    f"Cannot convert OutcomeSpace to a discrete OutcomeSpace with at most {max_cardinality} (at least {self._cardinality} outcomes are required)"
+                )
+            return DiscreteCartesianOutcomeSpace(issues=self.issues, name=self.name)
+        discrete = [_.is_discrete() for _ in self.issues]
         if max_cardinality != float("inf"):
-            c = reduce(
-                mul,
-                [_.cardinality if _.is_discrete() else levels for _ in self.issues],
-                1,
+            c = prod(
+                issue.cardinality if d else levels
+                for issue, d in zip(self.issues, discrete)
             )
             if c > max_cardinality:
                 raise ValueError(
                     f"Cannot convert OutcomeSpace to a discrete OutcomeSpace with at most {max_cardinality} (at least {c} outcomes are required)"
                 )
         issues = tuple(
-            issue.to_discrete(
-                levels if issue.is_continuous() else None,
-                compact=False,
-                grid=True,
-                endpoints=True,
-            )
-            for issue in self.issues
+            issue
+            if d
+            else issue.to_discrete(levels, compact=False, grid=True, endpoints=True)
+            for issue, d in zip(self.issues, discrete)
         )
         return DiscreteCartesianOutcomeSpace(issues=issues, name=self.name)
 
@@ -213,10 +371,7 @@ class CartesianOutcomeSpace(XmlSerializable):
         )
         if not issues:
             raise ValueError(f"Failed to read an issue space from an xml string")
-        issues = tuple(issues)
-        if all(isinstance(_, DiscreteIssue) for _ in issues):
-            return DiscreteCartesianOutcomeSpace(issues, name=name)
-        return cls(issues, name=name)
+        return make_os(issues, name=name)
 
     @staticmethod
     def from_outcomes(
@@ -253,11 +408,9 @@ class CartesianOutcomeSpace(XmlSerializable):
     def cardinality_if_discretized(
         self, levels: int, max_cardinality: int | float = float("inf")
     ) -> int:
-        c = reduce(
-            mul,
-            [_.cardinality if _.is_discrete() else levels for _ in self.issues],
-            1,
-        )
+        if self._is_discrete:
+            return min(self._cardinality, max_cardinality)
+        c = prod(_.cardinality if _.is_discrete() else levels for _ in self.issues)
         return min(c, max_cardinality)
 
     def to_largest_discrete(
@@ -343,22 +496,24 @@ class CartesianOutcomeSpace(XmlSerializable):
         return False
 
 
-@define(frozen=True)
+@define(frozen=True, eq=False, getstate_setstate=False)
 class DiscreteCartesianOutcomeSpace(CartesianOutcomeSpace):
     """
     A discrete outcome-space that is generated by the cartesian product of a tuple of `Issue` s (i.e. with finite number of outcomes).
     """
 
     def __attrs_post_init__(self):
-        for issue in self.issues:
-            if not issue.is_discrete():
-                raise ValueError(
-                    f"Issue is not discrete. Cannot be added to a DiscreteOutcomeSpace. You must discretize it first: {issue} "
-                )
+        self._cache_issue_properties()
+        if self._is_discrete:
+            return
+        issue = next(_ for _ in self.issues if not _.is_discrete())
+        raise ValueError(
+            f"Issue is not discrete. Cannot be added to a DiscreteOutcomeSpace. You must discretize it first: {issue} "
+        )
 
     @property
     def cardinality(self) -> int:
-        return reduce(mul, [_.cardinality for _ in self.issues], 1)
+        return self._cardinality  # type: ignore All issues are discrete so this is an int
 
     def cardinality_if_discretized(
         self, levels: int, max_cardinality: int | float = float("inf")
@@ -366,10 +521,124 @@ class DiscreteCartesianOutcomeSpace(CartesianOutcomeSpace):
         return self.cardinality
 
     def enumerate(self) -> Iterable[Outcome]:
+        if len(self.issues) == 1:
+            return [(_,) for _ in self.issues[0].all]
         return enumerate_discrete_issues(
             self.issues
         )  #  type: ignore I know that all my issues are actually discrete
 
+    def enumerate_columns(self) -> list[np.ndarray]:
+        """
+        Enumerates all outcomes column-wise (i.e. as one array per issue).
+
+        Returns:
+            A list with an array for each issue. The `k` th element of each array is the value of that issue in the
+            `k` th outcome returned by `enumerate()`.
+
+        Remarks:
+            - Avoids creating a tuple per outcome which makes it more suitable than `enumerate()` for
+              vectorized processing of all outcomes.
+            - Values of numeric issues are given as numeric arrays. Other values are given as arrays of objects.
+        """
+        columns = []
+        for issue, indices in zip(self.issues, self._enumerate_indices().T):
+            if issue.is_numeric():
+                values = np.asarray(list(issue.all))
+            else:
+                # filled one by one to avoid numpy splitting tuple values into a second dimension
+                values = np.empty(issue.cardinality, dtype=object)
+                for i, v in enumerate(issue.all):
+                    values[i] = v
+            columns.append(values[indices])
+        return columns
+
+    def index_of(self, outcome: Outcome) -> int:
+        """
+        Returns the index of the given outcome in the list of outcomes returned by `enumerate()`
+
+        Remarks:
+            - Raises a `ValueError` if the outcome is not in the outcome-space
+            - The inverse of `outcome_at()`
+        """
+        if len(outcome) != len(self.issues):
+            raise ValueError(
+                f"{outcome} has {len(outcome)} values but the outcome-space has {len(self.issues)} issues"
+            )
+        index = 0
+        for v, indices, stride in zip(
+            outcome, self._issue_value_indices(), self._issue_strides()
+        ):
+            try:
+                i = indices[v] if isinstance(indices, dict) else indices.index(v)
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"{outcome} is not in the outcome-space")
+            index += i * stride
+        return index
+
+    def outcome_at(self, index: int) -> Outcome:
+        """
+        Returns the outcome at the given index of the list of outcomes returned by `enumerate()`
+
+        Remarks:
+            - Raises an `IndexError` if the index is not in the range [0, cardinality)
+            - The inverse of `index_of()`
+        """
+        if not 0 <= index < self.cardinality:
+            raise IndexError(index)
+        values = []
+        for issue, stride in zip(self.issues, self._issue_strides()):
+            i, index = divmod(index, stride)
+            values.append(issue.value_at(i))
+        return tuple(values)
+
+    def _issue_strides(self) -> tuple[int, ...]:
+        """
+        Returns the stride of each issue in the mixed-radix numbering of outcomes used by `enumerate()`
+
+        Remarks:
+            - The stride of an issue is the product of the cardinalities of all issues after it.
+            - Calculated on first use and cached.
+        """
+        if self._strides is None:
+            strides, stride = [], 1
+            for issue in reversed(self.issues):
+                strides.append(stride)
+                stride *= issue.cardinality
+            object.__setattr__(self, "_strides", tuple(reversed(strides)))
+        return self._strides  # type: ignore Cannot be None at this point
+
+    def _issue_value_indices(self) -> tuple:
+        """
+        Returns for each issue a mapping from its values to their indices.
+
+        Remarks:
+            - Calculated on first use and cached. Issues with unhashable values get their list of values instead.
+        """
+        if self._value_indices is None:
+            value_indices = []
+            for issue in self.issues:
+                values = list(issue.all)
+                try:
+                    value_indices.append({v: i for i, v in enumerate(values)})
+                except TypeError:
+                    value_indices.append(values)
+            object.__setattr__(self, "_value_indices", tuple(value_indices))
+        return self._value_indices  # type: ignore Cannot be None at this point
+
+    def _enumerate_indices(self) -> np.ndarray:
+        """
+        Enumerates the value indices of all outcomes as an (n_outcomes, n_issues) integer array.
+
+        Remarks:
+            - Row `k` gives, for each issue, the index of its value in `issue.all` for the `k` th outcome of `enumerate()`
+            - The whole grid is built by numpy without creating any per-outcome python objects.
+        """
+        return (
+            np.indices([_.cardinality for _ in self.issues], dtype=np.int32)
+            .reshape(len(self.issues), -1)
+            .T
+        )
+
     def limit_cardinality(
         self,
         max_cardinality: int | float = float("inf"),
@@ -382,53 +651,44 @@ class DiscreteCartesianOutcomeSpace(CartesianOutcomeSpace):
             max_cardinality: The maximum number of outcomes in the resulting space
             levels: The maximum number of levels for each issue/subissue
         """
-        if self.cardinality <= max_cardinality or all(
-            _.cardinality < levels for _ in self.issues
+        if self.cardinality <= max_cardinality and all(
+            _.cardinality <= levels for _ in self.issues
         ):
             return self
-        new_levels = [_.cardinality for _ in self.issues]  # type: ignore will be corrected the next line
-        new_levels = [int(_) if _ < levels else int(levels) for _ in new_levels]
-        new_cardinality = reduce(mul, new_levels, 1)
+        # only contiguous issues can be reduced. Other issues keep all their values
+        shrinkable = [isinstance(_, ContiguousIssue) for _ in self.issues]
+        new_levels = [
+            int(_.cardinality) if _.cardinality < levels or not s else int(levels)
+            for _, s in zip(self.issues, shrinkable)
+        ]
+        new_cardinality = prod(new_levels)
 
         def _reduce_total_cardinality(new_levels, max_cardinality, new_cardinality):
-            sort = reversed(sorted((_, i) for i, _ in enumerate(new_levels)))
-            sorted_levels = [_[0] for _ in sort]
-            indices = [_[1] for _ in sort]
-            needed = new_cardinality - max_cardinality
-            current = 0
-            n = len(sorted_levels)
-            while needed > 0 and current < n:
-                nxt = n - 1
-                v = sorted_levels[current]
-                if v == 1:
-                    continue
-                for i in range(current + 1, n - 1):
-                    if v == sorted_levels[i]:
-                        continue
-                    nxt = i
+            # always reduce the issue with the largest number of levels by one
+            heap = [(-v, i) for i, v in enumerate(new_levels) if shrinkable[i]]
+            heapify(heap)
+            while heap and new_cardinality > max_cardinality:
+                v, i = heappop(heap)
+                v = -v
+                if v <= 1:
                     break
-                diff = v - sorted_levels[nxt]
-                if not diff:
-                    diff = 1
-                new_levels[indices[current]] -= 1
-                max_cardinality = (max_cardinality // v) * (v - 1)
-                sort = reversed(sorted((_, i) for i, _ in enumerate(new_levels)))
-                sorted_levels = [_[0] for _ in sort]
-                current = 0
-                needed = new_cardinality - max_cardinality
+                new_cardinality = (new_cardinality // v) * (v - 1)
+                new_levels[i] = v - 1
+                heappush(heap, (1 - v, i))
             return new_levels
 
         if new_cardinality > max_cardinality:
             new_levels: list[int] = _reduce_total_cardinality(
                 new_levels, max_cardinality, new_cardinality
             )
-        issues: list[Issue] = []
-        for j, i, issue in zip(
-            new_levels, (_.cardinality for _ in self.issues), self.issues
-        ):
-            issues.append(issue if j >= i else issue.to_discrete(j, compact=True))
+        issues = tuple(
+            issue if j >= issue.cardinality else issue.to_discrete(j, compact=True)
+            for j, issue in zip(new_levels, self.issues)
+        )
+        if all(a is b for a, b in zip(issues, self.issues)):
+            return self
         return DiscreteCartesianOutcomeSpace(
-            tuple(issues), name=f"{self.name}-{max_cardinality}"
+            issues, name=f"{self.name}-{max_cardinality}"
         )
 
     def is_discrete(self) -> bool:
@@ -452,19 +712,15 @@ class DiscreteCartesianOutcomeSpace(CartesianOutcomeSpace):
             - maps the agenda and ufuns to work correctly together
             - Only works if the outcome space is finite
         """
-        outcomes = list(self.enumerate())
-        values = (
-            range(len(outcomes))
-            if numeric
-            else [f"v{_}" for _ in range(len(outcomes))]
-            if stringify
-            else outcomes
-        )
-        issue = (
-            ContiguousIssue(len(outcomes), name="-".join(self.issue_names))
-            if numeric
-            else CategoricalIssue(values, name="-".join(self.issue_names))
-        )
+        name = "-".join(self._issue_names)
+        if numeric:
+            issue = ContiguousIssue(self.cardinality, name=name)
+        elif stringify:
+            issue = CategoricalIssue(
+                [f"v{_}" for _ in range(self.cardinality)], name=name
+            )
+        else:
+            issue = CategoricalIssue(list(self.enumerate()), name=name)
         return DiscreteCartesianOutcomeSpace(
             issues=(issue,),
             name=self.name,
@@ -479,20 +735,23 @@ class DiscreteCartesianOutcomeSpace(CartesianOutcomeSpace):
         """
         Samples up to n_outcomes with or without replacement.
 
-        This methor provides a base implementation that is not memory efficient.
-        It will simply create a list of all outcomes using `enumerate()` and then
-        samples from it. Specific outcome space types should override this method
-        to improve its efficiency if possible.
+        Outcome indices are sampled and only the sampled outcomes are created
+        (using `outcome_at()`) so the outcome-space is never enumerated.
 
         """
-        outcomes = self.enumerate()
-        outcomes = list(outcomes)
+        if len(self.issues) == 1:
+            values = list(self.issues[0].all)
+            if with_replacement:
+                return [(_,) for _ in random.choices(values, k=n_outcomes)]
+            if fail_if_not_enough and n_outcomes > len(values):
+                raise ValueError("Cannot sample enough")
+            return [(_,) for _ in random.sample(values, min(n_outcomes, len(values)))]
+        n = self.cardinality
         if with_replacement:
-            return random.choices(outcomes, k=n_outcomes)
-        if fail_if_not_enough and n_outcomes > self.cardinality:
+            return [self.outcome_at(_) for _ in random.choices(range(n), k=n_outcomes)]
+        if fail_if_not_enough and n_outcomes > n:
             raise ValueError("Cannot sample enough")
-        random.shuffle(outcomes)
-        return outcomes[:n_outcomes]
+        return [self.outcome_at(_) for _ in random.sample(range(n), min(n_outcomes, n))]
 
     def __iter__(self):
         return self.enumerate().__iter__()
@@ -118,6 +118,19 @@ class MappingUtilityFunction(StationaryMixin, UtilityFunction):
 
         return m
 
+    def eval_all(self, outcomes: Iterable[Outcome | None]) -> np.ndarray:
+        if not isinstance(self.mapping, dict):
+            return super().eval_all(outcomes)
+        outcomes = list(outcomes)
+        get, default, r = self.mapping.get, self.default, self.reserved_value
+        try:
+            return np.asarray(
+                [r if _ is None else get(_, default) for _ in outcomes], dtype=float
+            )
+        except TypeError:
+            # unhashable outcomes are evaluated one by one (see `eval`)
+            return super().eval_all(outcomes)
+
     def xml(self, issues: list[Issue]) -> str:
         """
 
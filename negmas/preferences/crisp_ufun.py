@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 import random
 from abc import abstractmethod
-from typing import TypeVar
+from typing import Iterable, TypeVar
 
 import numpy as np
 
@@ -28,6 +28,22 @@ class UtilityFunction(_General, BaseUtilityFunction):
     def eval(self, offer: Outcome) -> float:
         ...
 
+    def eval_all(self, outcomes: Iterable[Outcome | None]) -> np.ndarray:
+        """
+        Calculates the utility values of all given outcomes at once
+
+        Args:
+            outcomes: The outcomes to evaluate (`None` evaluates to the reserved value)
+
+        Returns:
+            A one-dimensional float array with one utility value per outcome
+
+        Remarks:
+            - The default implementation just calls the ufun on every outcome. Subclasses
+              that can evaluate many outcomes together should override it.
+        """
+        return np.asarray([self(_) for _ in outcomes], dtype=float)
+
     def to_crisp(self) -> UtilityFunction:
         return self
 
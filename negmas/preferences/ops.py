@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+import itertools
 import math
 from typing import TYPE_CHECKING, Iterable, TypeVar
 
 import numpy as np
-from numpy.ma.core import sqrt
 
 from negmas import warnings
-from negmas.outcomes import Issue, Outcome, discretize_and_enumerate_issues
+from negmas.outcomes import Issue, Outcome, discretize_issues
 from negmas.outcomes.common import os_or_none
 from negmas.outcomes.issue_ops import enumerate_issues
 from negmas.outcomes.protocols import OutcomeSpace
@@ -36,8 +36,14 @@ __all__ = [
     "conflict_level",
     "opposition_level",
     "winwin_level",
+    "utility_matrix",
 ]
 
+PARETO_BLOCK_SIZE = 1 << 22
+"""Maximum number of point pairs compared at once when finding pareto frontiers"""
+PARETO_CHUNK_SIZE = 4096
+"""Number of outcomes evaluated at once when finding pareto frontiers of issues"""
+
 
 def make_discounted_ufun(
     ufun: UFunType,
@@ -114,6 +120,31 @@ def make_discounted_ufun(
     return ufun
 
 
+def utility_matrix(
+    ufuns: tuple[UtilityFunction, ...], outcomes: list[Outcome]
+) -> np.ndarray:
+    """Evaluates all ufuns on all outcomes
+
+    Args:
+        ufuns: The utility functions
+        outcomes: The outcomes to evaluate
+
+    Returns:
+        An (n_outcomes, n_ufuns) array with the utility of every outcome for every ufun
+
+    """
+    if not ufuns:
+        return np.empty((len(outcomes), 0))
+    return np.column_stack(
+        [
+            u.eval_all(outcomes)
+            if hasattr(u, "eval_all")
+            else np.asarray([u(_) for _ in outcomes], dtype=float)
+            for u in ufuns
+        ]
+    )
+
+
 def _pareto_frontier(
     points, eps=-1e-18, sort_by_welfare=False
 ) -> tuple[list[tuple[float]], list[int]]:
@@ -126,51 +157,60 @@ def _pareto_frontier(
 
     Returns:
 
+    Remarks:
+        - Points are visited in descending lexicographic order so that a point can only be
+          dominated by points preceding it. A point is dropped if any preceding point is at
+          least as good in every dimension which also keeps a single copy of repeated points.
+        - A point `q` is at least as good as `p` in a dimension if `q >= p + eps`. A negative
+          `eps` thus drops points that improve on a preceding point by less than `-eps`.
+        - With two utility functions, this check reduces to a sweep keeping the running maximum
+          of the second utility value (O(n log n) instead of O(n^2)).
+        - Otherwise, points are checked in blocks so that no more than `PARETO_BLOCK_SIZE`
+          pairs are compared at once and each block is only compared with points not
+          dropped so far which makes the cost proportional to the size of the frontier.
+        - Unless `sort_by_welfare` is given, the frontier is returned in that order (i.e.
+          descendingly by the first utility value).
+
     """
-    points = np.asarray(points)
-    n = len(points)
-    indices = np.array(range(n))
-    for j in range(points.shape[1]):
-        order = points[:, 0].argsort()[-1::-1]
-        points = points[order]
-        indices = indices[order]
-
-    frontier = [(indices[0], points[0, :])]
-    for p in range(1, n):
-        current = points[p, :]
-        for i, (_, f) in enumerate(frontier):
-            current_better, current_worse = current > f, current < f
-            if np.all(current == f):
-                break
-            if not np.any(current_better) and np.any(current_worse):
-                # current is dominated, break
-                break
-            if np.any(current_better):
-                if not np.any(current_worse):
-                    # current dominates f, append it, remove f and scan for anything else dominated by current
-                    for j, (_, g) in enumerate(frontier[i + 1 :]):
-                        if np.all(current == g):
-                            frontier = frontier[:i] + frontier[i + 1 :]
-                            break
-                        if np.any(current > g) and not np.any(current < g):
-                            frontier = frontier[:j] + frontier[j + 1 :]
-                    else:
-                        frontier[i] = (indices[p], current)
-                else:
-                    # neither current nor f dominate each other, append current only if it is not
-                    # dominated by anything in frontier
-                    for j, (_, g) in enumerate(frontier[i + 1 :]):
-                        if np.all(current == g) or (
-                            np.any(g > current) and not np.any(current > g)
-                        ):
-                            break
-                    else:
-                        frontier.append((indices[p], current))
+    points = np.asarray(points, dtype=float)
+    if points.size == 0:
+        return [], []
+    indices = np.lexsort(-points.T[::-1])
+    points = points[indices]
+    if points.shape[1] == 1:
+        # with a single ufun, the best point (first in order) weakly dominates all others
+        # unless eps is positive
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = points[1:, 0] + eps > points[0, 0]
+    elif points.shape[1] == 2:
+        # skyline sweep: a point survives only if it beats the best second utility
+        # of every point preceding it (by more than -eps)
+        best = np.maximum.accumulate(points[:, 1])
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = points[1:, 1] + eps > best[:-1]
+    else:
+        # candidates are checked in blocks to bound the size of the comparison arrays.
+        # Keeping each utility in its own contiguous array makes every comparison a
+        # simple one-dimensional broadcast (much faster than broadcasting over rows).
+        n = len(points)
+        columns = np.ascontiguousarray(points.T)
+        block_size = max(1, PARETO_BLOCK_SIZE // n)
+        keep = np.ones(n, dtype=bool)
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            # dominance is transitive so points already dropped need not be checked
+            alive = np.flatnonzero(keep[:stop])
+            ge = np.ones((stop - start, len(alive)), dtype=bool)
+            for column in columns:
+                ge &= column[None, alive] >= column[start:stop, None] + eps
+            # only points preceding each candidate can dominate it
+            ge &= alive[None, :] < np.arange(start, stop)[:, None]
+            keep[start:stop] = ~ge.any(axis=1)
+    indices, points = indices[keep], points[keep]
     if sort_by_welfare:
-        welfare = [np.sum(_[1]) for _ in frontier]
-        indx = sorted(range(len(welfare)), key=lambda x: welfare[x], reverse=True)
-        frontier = [frontier[_] for _ in indx]
-    return [tuple(_[1]) for _ in frontier], [_[0] for _ in frontier]
+        order = np.argsort(-points.sum(axis=1), kind="stable")
+        indices, points = indices[order], points[order]
+    return [tuple(_) for _ in points], indices.tolist()
 
 
 def nash_point(
@@ -179,6 +219,8 @@ def nash_point(
     outcome_space: OutcomeSpace | None = None,
     issues: tuple[Issue] | None = None,
     outcomes: tuple[Outcome] | None = None,
+    ranges: Iterable[tuple[float, float]] | None = None,
+    utilities: np.ndarray | None = None,
 ) -> tuple[tuple[float, ...] | None, int | None]:
     """
     Calculates the nash point on the pareto frontier of a negotiation
@@ -189,6 +231,10 @@ def nash_point(
         outcome_space: The outcome-space to consider
         issues: The issues on which the ufun is defined (outcomes may be passed instead)
         outcomes: The outcomes on which the ufun is defined (outcomes may be passed instead)
+        ranges: The (minimum, maximum) utility value of each ufun. If not given, they are
+                calculated using the outcome-space, issues or outcomes given
+        utilities: The utility values of all outcomes (a row per outcome and a column per ufun)
+                   if already known. Used to find the ranges when these are not given
 
     Returns:
 
@@ -200,12 +246,27 @@ def nash_point(
     Remarks:
 
         - The function searches within the given frontier only.
+        - The nash point maximizes the product of utility gains over the reserved values
+          (normalized by the utility ranges). Points giving any ufun less than its reserved
+          value are never selected and (None, None) is returned if no such point exists.
 
     """
-    nash_val = float("-inf")
-    u_vals = None
-    nash_indx = None
-    ranges = [_.minmax(outcome_space, issues, outcomes) for _ in ufuns]
+    frontier = list(frontier)
+    if not frontier:
+        return None, None
+    ufuns = tuple(ufuns)
+    if ranges is not None:
+        ranges = list(ranges)
+    elif utilities is not None or (outcomes and outcome_space is None and not issues):
+        # a single batch evaluation gives the ranges of all ufuns together
+        if utilities is None:
+            utilities = utility_matrix(ufuns, list(outcomes))
+        utilities = np.asarray(utilities, dtype=float)
+        ranges = list(
+            zip(utilities.min(axis=0).tolist(), utilities.max(axis=0).tolist())
+        )
+    else:
+        ranges = [_.minmax(outcome_space, issues, outcomes) for _ in ufuns]
     for i, (rng, ufun) in enumerate(zip(ranges, ufuns)):
         if any(_ is None or not math.isfinite(_) for _ in rng):
             return None, None
@@ -215,16 +276,19 @@ def nash_point(
         ranges[i] = (r, rng[1])
     if any([_[1] <= 1.0e-9 for _ in ranges]):
         return None, None
-    diffs = [float(b) - float(r) for r, b in ranges]
-    for indx, us in enumerate(frontier):
-        val = 0.0
-        for u, (r, _), d in zip(us, ranges, diffs):
-            val *= (float(u) - float(r)) / d
-        if val > nash_val:
-            nash_val = val
-            u_vals = us
-            nash_indx = indx
-    return u_vals, nash_indx
+    reserves = np.asarray([_[0] for _ in ranges], dtype=float)
+    diffs = np.asarray([_[1] for _ in ranges], dtype=float) - reserves
+    if np.any(diffs <= 0):
+        return None, None
+    # scaling by reciprocals replaces a division per frontier point and ufun
+    scales = 1.0 / diffs
+    gains = (np.asarray(frontier, dtype=float) - reserves) * scales
+    # only points that are acceptable to everyone can be the nash point
+    vals = np.where(np.all(gains >= 0, axis=1), np.prod(gains, axis=1), float("-inf"))
+    nash_indx = int(np.argmax(vals))
+    if vals[nash_indx] == float("-inf"):
+        return None, None
+    return frontier[nash_indx], nash_indx
 
 
 def pareto_frontier(
@@ -233,6 +297,7 @@ def pareto_frontier(
     issues: Iterable[Issue] = None,
     n_discretization: int | None = 10,
     sort_by_welfare=False,
+    utilities: np.ndarray | None = None,
 ) -> tuple[list[tuple[float, ...]], list[int]]:
     """Finds all pareto-optimal outcomes in the list
 
@@ -243,12 +308,16 @@ def pareto_frontier(
         issues: The set of issues (only used when outcomes is None)
         n_discretization: The number of items to discretize each real-dimension into
         sort_by_welfare: If True, the resutls are sorted descendingly by total welfare
+        utilities: The utility values of all outcomes (a row per outcome and a column per ufun)
+                   if already known. If given, the ufuns are not evaluated again
 
     Returns:
         Two lists of the same length. First list gives the utilities at pareto frontier points and second list gives their indices
 
     """
 
+    if utilities is not None:
+        return _pareto_frontier(utilities, sort_by_welfare=sort_by_welfare)
     ufuns = tuple(ufuns)
     if issues:
         issues = tuple(issues)
@@ -259,14 +328,49 @@ def pareto_frontier(
     if outcomes is None:
         if issues is None:
             return [], []
-        outcomes = discretize_and_enumerate_issues(issues, n_discretization)
-        # outcomes = itertools.product(
-        #     *[issue.value_generator(n=n_discretization) for issue in issues]
-        # )
-    points = [[ufun(outcome) for ufun in ufuns] for outcome in outcomes]
+        # outcomes are generated in the same order as `discretize_and_enumerate_issues`
+        # but evaluated in chunks to avoid keeping all of them in memory
+        issues = discretize_issues(issues, n_discretization)
+        return _chunked_pareto_frontier(
+            ufuns,
+            itertools.product(*(_.all for _ in issues)),
+            sort_by_welfare=sort_by_welfare,
+        )
+    points = utility_matrix(ufuns, list(outcomes))
     return _pareto_frontier(points, sort_by_welfare=sort_by_welfare)
 
 
+def _chunked_pareto_frontier(
+    ufuns: tuple[UtilityFunction, ...],
+    outcomes: Iterable[Outcome],
+    sort_by_welfare=False,
+) -> tuple[list[tuple[float, ...]], list[int]]:
+    """Finds the pareto-frontier evaluating `PARETO_CHUNK_SIZE` outcomes at a time
+
+    Remarks:
+        - Only the frontier found so far is kept between chunks so memory use does not
+          grow with the number of outcomes.
+        - Results (including their order) are the same as those of `_pareto_frontier` on
+          all outcomes.
+    """
+    outcomes = iter(outcomes)
+    points = np.empty((0, len(ufuns)))
+    indices = np.empty(0, dtype=int)
+    n = 0
+    while True:
+        chunk = [tuple(_) for _ in itertools.islice(outcomes, PARETO_CHUNK_SIZE)]
+        if not chunk:
+            break
+        points = np.vstack((points, utility_matrix(ufuns, chunk)))
+        indices = np.concatenate((indices, np.arange(n, n + len(chunk))))
+        n += len(chunk)
+        # points from earlier chunks precede later ones so ties keep the first outcome
+        _, keep = _pareto_frontier(points)
+        points, indices = points[keep], indices[keep]
+    frontier, keep = _pareto_frontier(points, sort_by_welfare=sort_by_welfare)
+    return frontier, indices[keep].tolist()
+
+
 def scale_max(
     ufun: UFunType,
     to: float = 1.0,
@@ -407,6 +511,7 @@ def opposition_level(
     outcomes: int | list[Outcome] = None,
     issues: list[Issue] = None,
     max_tests: int = 10000,
+    utilities: np.ndarray | None = None,
 ) -> float:
     """
     Finds the opposition level of the two ufuns defined as the minimum distance to outcome (1, 1)
@@ -419,6 +524,10 @@ def opposition_level(
         issues: The issues (only used if outcomes is None).
         max_tests: The maximum number of outcomes to use. Only used if issues is given and has more
                    outcomes than this value.
+        utilities: The utility values of the outcomes (a row per outcome and a column per ufun)
+                   if already known. If given, the ufuns are not evaluated again and neither
+                   outcomes nor issues are needed. If outcomes are also given, they must
+                   match the rows.
 
 
     Examples:
@@ -437,9 +546,9 @@ def opposition_level(
         0.7114582486036499
 
     """
-    if outcomes is None:
+    if outcomes is None and utilities is None:
         if issues is None:
-            raise ValueError("You must either give outcomes or issues")
+            raise ValueError("You must either give outcomes, issues or utilities")
         outcomes = list(enumerate_issues(tuple(issues), max_cardinality=max_tests))
     if isinstance(outcomes, int):
         outcomes = [(_,) for _ in range(outcomes)]
@@ -450,22 +559,45 @@ def opposition_level(
             f"Cannot use {len(ufuns)} ufuns with only {len(max_utils)} max. utility values"
         )
 
-    nearest_val = float("inf")
-    for outcome in outcomes:
-        v = sum(
-            (1.0 - float(u(outcome)) / max_util) ** 2
-            if max_util
-            else (1.0 - float(u(outcome))) ** 2
-            for max_util, u in zip(max_utils, ufuns)
-        )
-        if v == float("inf"):
-            warnings.warn(
-                f"u is infinity: {outcome}, {[_(outcome) for _ in ufuns]}, max_utils",
-                warnings.NegmasNumericWarning,
+    if outcomes is not None:
+        outcomes = list(outcomes)
+    if utilities is None:
+        if not outcomes:
+            return float("inf")
+        utils = utility_matrix(tuple(ufuns), outcomes)
+    else:
+        utils = np.asarray(utilities, dtype=float)
+        if outcomes is not None and len(outcomes) != len(utils):
+            raise ValueError(
+                f"Got {len(utils)} rows of utilities for {len(outcomes)} outcomes"
             )
-        if v < nearest_val:
-            nearest_val = v
-    return sqrt(nearest_val)
+        if not len(utils):
+            return float("inf")
+    scale = np.asarray(max_utils, dtype=float)
+    # a zero maximum means that utilities are used without scaling
+    scale[scale == 0] = 1.0
+    distances = ((1.0 - utils / scale) ** 2).sum(axis=1)
+    infinite = np.isinf(distances)
+    if np.any(infinite):
+        i = int(np.argmax(infinite))
+        outcome = outcomes[i] if outcomes is not None else f"outcome #{i}"
+        warnings.warn(
+            f"u is infinity: {outcome}, {utils[i].tolist()}, max_utils",
+            warnings.NegmasNumericWarning,
+        )
+    nearest_val = float(distances.min())
+    return math.sqrt(nearest_val)
+
+
+def _outcome_pairs(n: int, max_tests: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of all pairs of n outcomes or of `max_tests` random pairs if there are more"""
+    if n * (n - 1) // 2 <= max_tests:
+        return np.triu_indices(n, 1)
+    # sample pairs of distinct outcomes uniformly
+    i = np.random.randint(0, n, max_tests)
+    j = np.random.randint(0, n - 1, max_tests)
+    j += j >= i
+    return i, j
 
 
 def conflict_level(
@@ -480,6 +612,9 @@ def conflict_level(
     Args:
         u1: first utility function
         u2: second utility function
+        outcomes: A list of outcomes or an integer giving the number of outcomes
+        max_tests: The maximum number of outcome pairs to compare. If there are more pairs
+                   than this, a random sample of this size is compared.
 
     Examples:
         - A nonlinear strictly zero sum case
@@ -513,26 +648,15 @@ def conflict_level(
     n_outcomes = len(outcomes)
     if n_outcomes == 0:
         raise ValueError(f"Cannot calculate conflit level with no outcomes")
-    points = np.array([[u1(o), u2(o)] for o in outcomes])
-    order = np.random.permutation(np.array(range(n_outcomes)))
-    p1, p2 = points[order, 0], points[order, 1]
-    signs = []
-    trial = 0
-    for i in range(n_outcomes - 1):
-        for j in range(i + 1, n_outcomes):
-            if trial >= max_tests:
-                break
-            trial += 1
-            o11, o12 = p1[i], p1[j]
-            o21, o22 = p2[i], p2[j]
-            if o12 == o11 and o21 == o22:
-                continue
-            signs.append(int((o12 > o11 and o21 > o22) or (o12 < o11 and o21 < o22)))
-    signs = np.array(signs)
+    points = utility_matrix((u1, u2), outcomes)
+    i, j = _outcome_pairs(n_outcomes, max_tests)
+    d1 = points[j, 0] - points[i, 0]
+    d2 = points[j, 1] - points[i, 1]
+    nontrivial = (d1 != 0) | (d2 != 0)
     # todo: confirm this is correct
-    if len(signs) == 0:
+    if not np.any(nontrivial):
         return 1.0
-    return signs.mean()
+    return (d1[nontrivial] * d2[nontrivial] < 0).mean()
 
 
 def winwin_level(
@@ -547,6 +671,9 @@ def winwin_level(
     Args:
         u1: first utility function
         u2: second utility function
+        outcomes: A list of outcomes or an integer giving the number of outcomes
+        max_tests: The maximum number of outcome pairs to compare. If there are more pairs
+                   than this, a random sample of this size is compared.
 
     Examples:
         - A nonlinear same ufun case
@@ -568,33 +695,15 @@ def winwin_level(
         outcomes = [(_,) for _ in range(outcomes)]
     else:
         outcomes = list(outcomes)
-    n_outcomes = len(outcomes)
-    points = np.array([[u1(o), u2(o)] for o in outcomes])
-    order = np.random.permutation(np.array(range(n_outcomes)))
-    p1, p2 = points[order, 0], points[order, 1]
-    signed_diffs = []
-    for trial, (i, j) in enumerate(zip(range(n_outcomes - 1), range(1, n_outcomes))):
-        if trial >= max_tests:
-            break
-        o11, o12 = p1[i], p1[j]
-        o21, o22 = p2[i], p2[j]
-        if o11 == o12:
-            if o21 == o22:
-                continue
-            else:
-                win = abs(o22 - o21)
-        elif o11 < o12:
-            if o21 == o22:
-                win = o12 - o11
-            else:
-                win = (o12 - o11) + (o22 - o21)
-        else:
-            if o21 == o22:
-                win = o11 - o12
-            else:
-                win = (o11 - o12) + (o22 - o21)
-        signed_diffs.append(win)
-    signed_diffs = np.array(signed_diffs)
-    if len(signed_diffs) == 0:
+    points = utility_matrix((u1, u2), outcomes)
+    i, j = _outcome_pairs(len(outcomes), max_tests)
+    d1 = points[j, 0] - points[i, 0]
+    d2 = points[j, 1] - points[i, 1]
+    nontrivial = (d1 != 0) | (d2 != 0)
+    if not np.any(nontrivial):
         raise ValueError("Could not calculate any signs")
-    return signed_diffs.mean()
+    d1, d2 = d1[nontrivial], d2[nontrivial]
+    # the gain of the first ufun plus the change in the second when moving toward the
+    # outcome the first ufun prefers
+    wins = np.abs(d1) + np.where(d1 != 0, np.sign(d1) * d2, np.abs(d2))
+    return wins.mean()
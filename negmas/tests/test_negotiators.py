@@ -302,14 +302,12 @@ def test_controller():
             c.create_negotiator(),
             preferences=RandomUtilityFunction(outcome_space=session.outcome_space),
         )
-    completed: list[int] = []
-    while len(completed) < n_sessions:
-        for i, session in enumerate(sessions):
-            if i in completed:
-                continue
-            state = session.step()
+    done = np.zeros(n_sessions, dtype=bool)
+    while not done.all():
+        for i in np.flatnonzero(~done):
+            state = sessions[i].step()
             if state.broken or state.timedout or state.agreement is not None:
-                completed.append(i)
+                done[i] = True
     # we are just checking that the controller runs. No need to assert anything
 
 
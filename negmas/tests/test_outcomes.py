@@ -2,7 +2,14 @@ from __future__ import annotations
 
 import pytest
 
-from negmas import enumerate_issues, issues_from_outcomes, make_issue, outcome_is_valid
+from negmas import (
+    discretize_and_enumerate_issues,
+    discretize_issues,
+    enumerate_issues,
+    issues_from_outcomes,
+    make_issue,
+    outcome_is_valid,
+)
 
 from .fixtures import (
     cissue,
@@ -58,5 +65,13 @@ def test_from_outcomes():
         assert f._values[0] >= v[0] and f._values[1] <= v[1]
 
 
+def test_discretize_issues():
+    issues = [make_issue((0.0, 1.0), "price"), make_issue(["yes", "no"], "delivery")]
+    found = discretize_issues(issues, 5)
+    assert found[1] is issues[1]
+    assert found[0].name == "price" and found[0].cardinality == 5
+    assert discretize_and_enumerate_issues(issues, 5) == enumerate_issues(found)
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])
@@ -9,7 +9,12 @@ import pytest
 from hypothesis import given
 from pytest import mark
 
-from negmas.outcomes import enumerate_issues, issues_from_xml_str, make_issue
+from negmas.outcomes import (
+    discretize_and_enumerate_issues,
+    enumerate_issues,
+    issues_from_xml_str,
+    make_issue,
+)
 from negmas.outcomes.outcome_space import CartesianOutcomeSpace, make_os
 from negmas.preferences import (
     AffineUtilityFunction,
@@ -18,7 +23,11 @@ from negmas.preferences import (
     LinearUtilityFunction,
     MappingUtilityFunction,
     UtilityFunction,
+    conflict_level,
+    nash_point,
+    opposition_level,
     pareto_frontier,
+    winwin_level,
 )
 from negmas.preferences.crisp.const import ConstUtilityFunction
 from negmas.preferences.inv_ufun import PresortingInverseUtilityFunction
@@ -99,6 +108,172 @@ def test_pareto_frontier_does_not_depend_on_order():
         assert a in p2
 
 
+@mark.parametrize(
+    ["n_ufuns", "n_outcomes"], [(1, 20), (2, 50), (3, 50), (4, 20), (2, 1)]
+)
+def test_pareto_frontier_matches_brute_force(n_ufuns, n_outcomes):
+    # coarse values to get plenty of ties and repeated points
+    utils = np.random.randint(0, 5, size=(n_outcomes, n_ufuns)).astype(float)
+    ufuns = [
+        MappingUtilityFunction(lambda o, i=i: utils[o[0], i]) for i in range(n_ufuns)
+    ]
+    outcomes = [(_,) for _ in range(n_outcomes)]
+    frontier, indices = pareto_frontier(ufuns, outcomes=outcomes)
+
+    points = [tuple(_) for _ in utils]
+    expected = {
+        p
+        for p in points
+        if not any(
+            all(a >= b for a, b in zip(q, p)) and any(a > b for a, b in zip(q, p))
+            for q in points
+        )
+    }
+    assert len(frontier) == len(set(frontier)) == len(expected)
+    assert set(frontier) == expected
+    assert all(points[i] == f for i, f in zip(indices, frontier))
+    assert frontier == sorted(frontier, reverse=True)
+
+    welfare_sorted, _ = pareto_frontier(ufuns, outcomes=outcomes, sort_by_welfare=True)
+    # ties in welfare keep their order on the frontier
+    assert welfare_sorted == sorted(frontier, key=sum, reverse=True)
+
+
+@mark.parametrize("n_ufuns", [2, 3])
+def test_pareto_frontier_eps_drops_negligible_improvements(n_ufuns):
+    import negmas.preferences.ops as ops
+
+    points = [(1.0, 0.5, 0.0), (1.0 - 1e-9, 0.5 + 1e-9, 0.0), (0.0, 1.0, 0.0)]
+    points = [_[:n_ufuns] for _ in points]
+    assert ops._pareto_frontier(points)[1] == [0, 1, 2]
+    assert ops._pareto_frontier(points, eps=-1e-6)[1] == [0, 2]
+
+
+def test_pareto_frontier_does_not_depend_on_block_size(monkeypatch):
+    import negmas.preferences.ops as ops
+
+    points = np.random.randint(0, 5, size=(100, 3)).astype(float)
+    expected = ops._pareto_frontier(points)
+    for block_size in (1, 7, 100, 5000):
+        monkeypatch.setattr(ops, "PARETO_BLOCK_SIZE", block_size)
+        assert ops._pareto_frontier(points) == expected
+
+
+def test_pareto_frontier_of_issues_does_not_depend_on_chunk_size(monkeypatch):
+    import negmas.preferences.ops as ops
+
+    issues = [make_issue(10, "a"), make_issue(8, "b"), make_issue((0.0, 1.0), "c")]
+    ufuns = [
+        MappingUtilityFunction(lambda o: (7 * o[0] + 3 * o[1]) % 11 + o[2]),
+        MappingUtilityFunction(lambda o: (5 * o[0] + 2 * o[1]) % 13 - o[2]),
+        MappingUtilityFunction(lambda o: (o[0] * o[1]) % 5),
+    ]
+    outcomes = discretize_and_enumerate_issues(issues, 5)
+    expected = pareto_frontier(ufuns, outcomes=outcomes, sort_by_welfare=True)
+    assert len(expected[0]) > 1
+    for chunk_size in (1, 7, 100):
+        monkeypatch.setattr(ops, "PARETO_CHUNK_SIZE", chunk_size)
+        found = pareto_frontier(
+            ufuns, issues=issues, n_discretization=5, sort_by_welfare=True
+        )
+        assert found == expected
+
+
+def test_nash_point_maximizes_product_of_gains():
+    outcomes = [(_,) for _ in range(5)]
+    u1 = MappingUtilityFunction(
+        dict(zip(outcomes, [0.0, 0.2, 0.5, 0.8, 1.0])), reserved_value=0.1
+    )
+    u2 = MappingUtilityFunction(
+        dict(zip(outcomes, [1.0, 0.9, 0.6, 0.3, 0.0])), reserved_value=0.0
+    )
+    frontier, indices = pareto_frontier([u1, u2], outcomes=outcomes)
+    nash, indx = nash_point([u1, u2], frontier, outcomes=outcomes)
+    assert indices[indx] == 2
+    assert nash == frontier[indx] == (0.5, 0.6)
+    assert nash_point([u1, u2], frontier, ranges=[(0.0, 1.0)] * 2) == (nash, indx)
+    utilities = np.array([[u1(_), u2(_)] for _ in outcomes])
+    assert pareto_frontier([u1, u2], utilities=utilities) == (frontier, indices)
+    assert nash_point([u1, u2], frontier, utilities=utilities) == (nash, indx)
+    assert nash_point([u1, u2], [], outcomes=outcomes) == (None, None)
+    # no point on this frontier is acceptable for the first ufun
+    assert nash_point([u1, u2], [(0.0, 1.0)], outcomes=outcomes) == (None, None)
+
+
+def test_opposition_level_with_known_utilities():
+    u1 = MappingUtilityFunction(lambda x: x[0])
+    u2 = MappingUtilityFunction(lambda x: 9 - x[0])
+    outcomes = [(_,) for _ in range(10)]
+    utilities = np.asarray([[u1(_), u2(_)] for _ in outcomes])
+    expected = opposition_level([u1, u2], max_utils=9, outcomes=outcomes)
+    assert opposition_level([u1, u2], max_utils=9, utilities=utilities) == expected
+    assert (
+        opposition_level([u1, u2], max_utils=9, outcomes=outcomes, utilities=utilities)
+        == expected
+    )
+    with pytest.raises(ValueError):
+        opposition_level(
+            [u1, u2], max_utils=9, outcomes=outcomes[:5], utilities=utilities
+        )
+
+
+def test_conflict_level_counts_opposing_pairs():
+    outcomes = [(_,) for _ in range(30)]
+    utils = np.random.randint(0, 4, size=(len(outcomes), 2)).astype(float)
+    u1 = MappingUtilityFunction(dict(zip(outcomes, utils[:, 0])))
+    u2 = MappingUtilityFunction(dict(zip(outcomes, utils[:, 1])))
+    signs = [
+        (a[0] - b[0]) * (a[1] - b[1]) < 0
+        for k, a in enumerate(utils)
+        for b in utils[k + 1 :]
+        if (a != b).any()
+    ]
+    assert conflict_level(u1, u2, outcomes) == pytest.approx(np.mean(signs))
+    sampled = conflict_level(u1, u2, outcomes, max_tests=100)
+    assert 0.0 <= sampled <= 1.0
+    u3 = MappingUtilityFunction(dict(zip(outcomes, -utils[:, 0])))
+    assert conflict_level(u1, u3, outcomes, max_tests=100) == 1.0
+
+
+def test_winwin_level():
+    outcomes = [(_,) for _ in range(10)]
+    values = np.random.random(len(outcomes))
+    u1 = MappingUtilityFunction(dict(zip(outcomes, values)))
+    u2 = MappingUtilityFunction(dict(zip(outcomes, 1.0 - values)))
+    gaps = [abs(a - b) for k, a in enumerate(values) for b in values[k + 1 :]]
+    assert winwin_level(u1, u1, outcomes) == pytest.approx(2 * np.mean(gaps))
+    assert winwin_level(u1, u2, outcomes) == pytest.approx(0.0)
+    assert winwin_level(u1, u2, outcomes, max_tests=5) == pytest.approx(0.0)
+    with pytest.raises(ValueError):
+        winwin_level(u1, u2, outcomes[:1])
+
+
+def test_eval_all_matches_calling_the_ufun():
+    outcomes = [(_,) for _ in range(5)] + [None]
+    ufuns = [
+        MappingUtilityFunction(
+            dict(zip(outcomes[:4], [0.1, 0.5, 0.3, 0.9])),
+            default=-1.0,
+            reserved_value=0.2,
+        ),
+        MappingUtilityFunction(lambda x: 2.0 * x[0], reserved_value=0.0),
+        LinearUtilityFunction(weights=[3.0], reserved_value=-1.0),
+    ]
+    for u in ufuns:
+        assert u.eval_all(outcomes).tolist() == [u(_) for _ in outcomes]
+
+
+def test_mapping_eval_all_with_unhashable_outcomes():
+    u = MappingUtilityFunction({(0,): 0.5, (1,): 0.7}, default=-1.0)
+    outcomes = [(0,), [1], (1,)]
+    assert u.eval_all(outcomes).tolist() == [u(_) for _ in outcomes]
+    assert u.eval_all(outcomes).tolist() == [0.5, -1.0, 0.7]
+
+
+def test_pareto_frontier_without_ufuns():
+    assert pareto_frontier([], outcomes=[(0,), (1,)]) == ([], [])
+
+
 def test_linear_utility():
     buyer_utility = LinearAdditiveUtilityFunction(
         {
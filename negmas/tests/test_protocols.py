@@ -13,6 +13,7 @@ from negmas import (
     MechanismRoundResult,
     RandomNegotiator,
     SAOMechanism,
+    UtilityFunction,
 )
 
 random.seed(0)
@@ -309,5 +310,68 @@ def test_same_utility_leads_to_agreement():
     assert state.step < 4
 
 
+def test_pareto_frontier_is_cached_until_ufuns_change(monkeypatch):
+    import negmas.mechanisms
+
+    calls = []
+    original = negmas.mechanisms.pareto_frontier
+
+    def counted(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(negmas.mechanisms, "pareto_frontier", counted)
+    outcomes = [(_,) for _ in range(10)]
+    neg = SAOMechanism(outcomes=outcomes, n_steps=10)
+    for values in (range(10), range(10, 0, -1)):
+        neg.add(
+            RandomNegotiator(
+                preferences=MappingUtilityFunction(dict(zip(outcomes, values)))
+            )
+        )
+    frontier, frontier_outcomes = neg.pareto_frontier()
+    assert neg.pareto_frontier() == (frontier, frontier_outcomes)
+    assert len(calls) == 1
+    neg.pareto_frontier(sort_by_welfare=False)
+    assert len(calls) == 2
+    neg.nash_point()
+    assert len(calls) == 2
+
+    neg.negotiators[0].set_preferences(
+        MappingUtilityFunction(dict(zip(outcomes, range(10, 0, -1)))), force=True
+    )
+    frontier, frontier_outcomes = neg.pareto_frontier()
+    assert len(calls) == 3
+    assert frontier_outcomes == [(0,)]
+
+
+class _ChangingUtilityFunction(UtilityFunction):
+    def __init__(self, values, **kwargs):
+        super().__init__(**kwargs)
+        self.values = values
+
+    def eval(self, offer):
+        if offer is None:
+            return self.reserved_value
+        return self.values[offer[0]]
+
+
+def test_pareto_frontier_is_not_cached_for_non_stationary_ufuns():
+    outcomes = [(_,) for _ in range(10)]
+    values = list(range(10))
+    neg = SAOMechanism(outcomes=outcomes, n_steps=10)
+    ufun = _ChangingUtilityFunction(values)
+    assert not ufun.is_stationary()
+    neg.add(RandomNegotiator(preferences=ufun))
+    neg.add(
+        RandomNegotiator(
+            preferences=MappingUtilityFunction(dict(zip(outcomes, values)))
+        )
+    )
+    assert neg.pareto_frontier()[1] == [(9,)]
+    values.reverse()
+    assert len(neg.pareto_frontier()[1]) == 10
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])
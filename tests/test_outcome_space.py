@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import pickle
+
+from pytest import mark, raises
+
+from negmas.outcomes import make_issue, make_os
+from negmas.outcomes.outcome_space import (
+    CartesianOutcomeSpace,
+    DiscreteCartesianOutcomeSpace,
+)
+
+
+@mark.parametrize(
+    "values",
+    [
+        [3, 4],
+        [(0, 4), ["a", "b", "c"]],
+        [(0.0, 1.0), 5],
+        [(0.0, 1.0), (2.0, 3.0)],
+        [[1.5, 2.5]],
+    ],
+)
+def test_cached_predicates_match_issues(values):
+    issues = [make_issue(v, name=f"i{i}") for i, v in enumerate(values)]
+    os = make_os(issues)
+    cardinality = 1
+    for issue in issues:
+        cardinality *= issue.cardinality
+    assert os.cardinality == cardinality
+    assert os.is_discrete() == all(_.is_discrete() for _ in issues)
+    assert os.is_all_continuous() == all(_.is_continuous() for _ in issues)
+    assert os.is_not_discrete() == any(_.is_continuous() for _ in issues)
+    assert os.is_numeric() == all(_.is_numeric() for _ in issues)
+    assert os.is_integer() == all(_.is_integer() for _ in issues)
+    assert os.is_float() == all(_.is_float() for _ in issues)
+    assert isinstance(os, DiscreteCartesianOutcomeSpace) == os.is_discrete()
+
+
+def test_enumerate_indices_matches_enumerate():
+    issues = [make_issue(3, "a"), make_issue(["x", "y"], "b"), make_issue((2, 5), "c")]
+    os = make_os(issues)
+    indices = os._enumerate_indices()
+    assert indices.shape == (os.cardinality, len(issues))
+    values = [list(_.all) for _ in issues]
+    assert [tuple(v[i] for v, i in zip(values, row)) for row in indices] == list(
+        os.enumerate()
+    )
+
+
+@mark.parametrize("max_cardinality", [210, 100, 50, 20, 1])
+def test_limit_cardinality(max_cardinality):
+    os = make_os([make_issue(10), make_issue(7), make_issue(3)])
+    limited = os.limit_cardinality(max_cardinality)
+    assert limited.cardinality <= max_cardinality
+    assert all(
+        a.cardinality <= b.cardinality for a, b in zip(limited.issues, os.issues)
+    )
+
+
+def test_limit_cardinality_by_levels():
+    os = make_os([make_issue(10), make_issue(7), make_issue(3)])
+    limited = os.limit_cardinality(levels=5)
+    assert [_.cardinality for _ in limited.issues] == [5, 5, 3]
+
+
+def test_limit_cardinality_keeps_issue_values():
+    os = make_os([make_issue((10, 20)), make_issue(7)])
+    limited = os.limit_cardinality(levels=5)
+    issue = limited.issues[0]
+    assert issue.cardinality == 5
+    assert all(os.issues[0].is_valid(_) for _ in issue.all)
+    assert list(issue.all) == [13, 14, 15, 16, 17]
+
+
+def test_limit_cardinality_with_categorical_issues():
+    os = make_os([make_issue(["a", "b", "c"]), make_issue(5)])
+    limited = os.limit_cardinality(6)
+    assert limited.cardinality <= 6
+    assert limited.issues[0] is os.issues[0]
+    assert limited.issues[1].cardinality == 2
+
+
+def test_is_valid_batch_matches_is_valid():
+    os = make_os(
+        [
+            make_issue((0.5, 2.0), "price"),
+            make_issue(["a", "b", "c"], "category"),
+            make_issue(10, "count"),
+        ]
+    )
+    outcomes = [
+        (1.0, "a", 3),
+        (3.0, "a", 3),
+        (1.0, "d", 3),
+        (1.0, "b", 11),
+        (0.5, "c", 0),
+        ("1.0", "c", 0),
+    ]
+    assert os.is_valid_batch(outcomes).tolist() == [os.is_valid(_) for _ in outcomes]
+    assert os.is_valid_batch([]).tolist() == []
+
+
+def test_hash_and_issue_names_survive_pickling():
+    issues = [make_issue(3, "a"), make_issue((0.0, 1.0), "b")]
+    for os in (make_os(issues), make_os(issues[:1])):
+        copied = pickle.loads(pickle.dumps(os))
+        assert copied == os
+        assert hash(copied) == hash(os)
+        assert copied.issue_names == os.issue_names
+        assert copied.cardinality == os.cardinality
+        assert {os: 1}[copied] == 1
+
+
+def test_transformations_share_unchanged_issues():
+    issues = (make_issue(3, "a"), make_issue(4, "b"))
+    os = CartesianOutcomeSpace(issues)
+    discrete = os.to_discrete()
+    assert isinstance(discrete, DiscreteCartesianOutcomeSpace)
+    assert discrete.issues is os.issues
+    categorical = make_os([make_issue(["a", "b", "c"]), make_issue(["x", "y"])])
+    assert categorical.limit_cardinality(2) is categorical
+
+
+def test_to_discrete_is_cached():
+    os = make_os([make_issue(3, "a"), make_issue((0.0, 1.0), "b")])
+    discrete = os.to_discrete(5)
+    assert os.to_discrete(5) is discrete
+    assert os.to_discrete(6) is not discrete
+    assert os.to_discrete(6).cardinality == 18
+
+
+def test_enumerate_columns_matches_enumerate():
+    os = make_os(
+        [make_issue(3, "a"), make_issue(["x", "y"], "b"), make_issue((2, 5), "c")]
+    )
+    for space in (os, os.to_single_issue(stringify=False)):
+        columns = space.enumerate_columns()
+        assert len(columns) == len(space.issues)
+        assert all(_.shape == (space.cardinality,) for _ in columns)
+        assert list(zip(*(_.tolist() for _ in columns))) == list(space.enumerate())
+
+
+def test_single_issue_enumerate_and_sample():
+    os = make_os([make_issue(["a", "b", "c", "d"], "x")])
+    assert os.enumerate() == [("a",), ("b",), ("c",), ("d",)]
+    samples = os.sample(3)
+    assert len(samples) == len(set(samples)) == 3
+    assert all(os.is_valid(_) for _ in samples)
+    assert len(os.sample(10, with_replacement=True)) == 10
+    assert sorted(os.sample(10, fail_if_not_enough=False)) == os.enumerate()
+    with raises(ValueError):
+        os.sample(10)
+
+
+def test_index_of_and_outcome_at_follow_enumerate():
+    os = make_os(
+        [make_issue(3, "a"), make_issue(["x", "y"], "b"), make_issue((2, 5), "c")]
+    )
+    for i, outcome in enumerate(os.enumerate()):
+        assert os.index_of(outcome) == i
+        assert os.outcome_at(i) == outcome
+    with raises(ValueError):
+        os.index_of((0, "z", 2))
+    with raises(IndexError):
+        os.outcome_at(os.cardinality)